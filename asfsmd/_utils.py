@@ -1,22 +1,92 @@
 """Utility functions for asfsmd."""
 
+import os
 import json
+import inspect
+import logging
 import pathlib
+import tempfile
 import collections
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional
 
-from .common import PathType
+from .common import Auth, PathType
+
+_log = logging.getLogger(__name__)
 
 
 def unique(data: Iterable[Any]) -> List[Any]:
     """Return a list of unique items preserving the input ordering."""
-    unique_items = []
-    unique_items_set = set()
-    for item in data:
-        if item not in unique_items_set:
-            unique_items.append(item)
-            unique_items_set.add(item)
-    return unique_items
+    return list(dict.fromkeys(data))
+
+
+def strip_extension(name: str) -> str:
+    """Strip the ".zip" and ".SAFE" extensions from a product name."""
+    # only the end of the name is inspected, while an anchored regex is
+    # tried at each position of it
+    while name.endswith((".zip", ".SAFE")):
+        name = name[: -4 if name.endswith(".zip") else -5]
+    return name
+
+
+def get_cache_dir() -> Optional[pathlib.Path]:
+    """Return the path of the asfsmd cache directory.
+
+    The path can be set by means of the `ASFSMD_CACHE_DIR` environment
+    variable, by default "$XDG_CACHE_HOME/asfsmd" (or "~/.cache/asfsmd")
+    is used.
+    If `ASFSMD_CACHE_DIR` is set to an empty string caching is disabled
+    and `None` is returned.
+    """
+    path = os.environ.get("ASFSMD_CACHE_DIR")
+    if path is not None:
+        return pathlib.Path(path) if path else None
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return pathlib.Path(cache_home) / "asfsmd"
+    return pathlib.Path.home() / ".cache" / "asfsmd"
+
+
+def write_bytes_atomic(path: PathType, data: bytes):
+    """Write data to file atomically.
+
+    Data are written to a temporary file that is then renamed, so that
+    readers never see partially written files.
+    Missing parent directories are created.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def prune_cache(path: PathType, max_size: int):
+    """Remove the least recently used files exceeding max_size.
+
+    Files are sorted by access time, so readers of cached files shall
+    update it explicitly (e.g. by means of `os.utime`) on file systems
+    mounted with the "noatime" or "relatime" options.
+    """
+    try:
+        entries = [(entry, entry.stat()) for entry in os.scandir(path)]
+    except OSError:
+        return
+    entries.sort(key=lambda item: item[1].st_atime_ns, reverse=True)
+    total_size = 0
+    for entry, entry_stat in entries:
+        total_size += entry_stat.st_size
+        if total_size > max_size:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                _log.debug("unable to remove %r", entry.path, exc_info=True)
+            else:
+                _log.debug("%r removed from the cache", entry.path)
 
 
 def load_product_lists(*filenames: PathType) -> Dict[str, List[str]]:
@@ -25,19 +95,58 @@ def load_product_lists(*filenames: PathType) -> Dict[str, List[str]]:
     for filename in filenames:
         filename = pathlib.Path(filename)
         if filename.suffix == ".json":
-            data.update(json.loads(filename.read_text()))
+            products = json.loads(filename.read_bytes())
+            if isinstance(products, list):
+                products = {"": products}
+            # merge lists with the same key from different files
+            for key, values in products.items():
+                data[key].extend(values)
         else:
-            with filename.open() as fd:
-                for line in fd:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    data[""].append(line)
+            # strip comments (also trailing ones) and blanks
+            lines = (
+                line.partition("#")[0].strip()
+                for line in filename.read_text().splitlines()
+            )
+            data[""].extend(line for line in lines if line)
 
     # Strip .zip or .SAFE extensions
     return {
-        key: unique(
-            item.replace(".zip", "").replace(".SAFE", "") for item in values
-        )
+        key: unique(strip_extension(item) for item in values)
         for key, values in data.items()
     }
+
+
+def make_session(auth: Optional[Auth] = None, pool_maxsize: int = 32):
+    """Return a `requests.Session` suitable for concurrent downloads.
+
+    The connection pool is large enough to be shared by all download
+    threads, and failed requests (connection errors and 429, 500, 502,
+    503 or 504 responses) are retried with exponential backoff,
+    honouring the "Retry-After" header sent by the server.
+    Only idempotent requests (GET and HEAD) are retried.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry_kwargs = {
+        "total": 5,
+        "backoff_factor": 0.5,
+        "status_forcelist": [429, 500, 502, 503, 504],
+    }
+    # @COMPATIBILITY: urllib3 < 1.26 uses "method_whitelist"
+    if "allowed_methods" in inspect.signature(Retry).parameters:
+        retry_kwargs["allowed_methods"] = ["GET", "HEAD"]
+    else:
+        retry_kwargs["method_whitelist"] = ["GET", "HEAD"]
+    retry = Retry(**retry_kwargs)
+    adapter = HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.auth = auth
+    return session
@@ -6,6 +6,7 @@
 import logging
 import pathlib
 import argparse
+import itertools
 import collections
 from typing import Dict, Iterable, List, Optional
 
@@ -14,13 +15,14 @@ import tqdm
 from . import __version__
 from . import __doc__ as _pkg_doc
 from .core import (
-    download_annotations,
+    CLIENT_IMPLEMENTATIONS,
     download_components_from_urls,
     make_patterns,
     _get_auth,
+    _query_urls,
 )
-from ._utils import unique, load_product_lists
-from .common import BLOCKSIZE, MB
+from ._utils import unique, strip_extension, load_product_lists
+from .common import MB, BLOCKSIZE, MAX_WORKERS
 
 try:
     from os import EX_OK
@@ -47,6 +49,10 @@ def asfsmd_cli(
     noprogress: bool = False,
     username: Optional[str] = None,
     password: Optional[str] = None,
+    *,
+    jobs: int = MAX_WORKERS,
+    client: Optional[str] = None,
+    blob_cache: bool = True,
 ):
     """High level function for ASF S1 Metadata Download."""
     auth = _get_auth(user=username, pwd=password)
@@ -68,6 +74,9 @@ def asfsmd_cli(
             auth=auth,
             block_size=block_size,
             noprogress=noprogress,
+            max_workers=jobs,
+            client=client,
+            blob_cache=blob_cache,
         )
     else:
         products_tree: Dict[str, List[str]] = collections.defaultdict(list)
@@ -76,27 +85,45 @@ def asfsmd_cli(
         else:
             # Ignore if user passed files with .zip or .SAFE extensions
             products_tree[""].extend(
-                unique(
-                    p.replace(".zip", "").replace(".SAFE", "") for p in inputs
-                )
+                unique(strip_extension(p) for p in inputs)
             )
 
+        # Query all the products at once
+        all_products = unique(itertools.chain(*products_tree.values()))
+        product_urls = _query_urls(all_products)
+
         items = pbar = tqdm.tqdm(products_tree.items(), disable=noprogress)
         for folder, products in items:
             pbar.set_description(folder if folder else "DOWNLOAD")
             outpath = outroot / folder
-            download_annotations(
-                products,
+            download_components_from_urls(
+                [product_urls[p] for p in products if p in product_urls],
                 outdir=outpath,
                 auth=auth,
                 patterns=patterns,
                 block_size=block_size,
                 noprogress=noprogress,
+                max_workers=jobs,
+                client=client,
+                blob_cache=blob_cache,
             )
 
     return EX_OK
 
 
+def _positive_int(value: str) -> int:
+    """Convert the input string into a positive integer."""
+    try:
+        result = int(value)
+    except ValueError:
+        result = 0
+    if result < 1:
+        raise argparse.ArgumentTypeError(
+            f"invalid positive int value: {value!r}"
+        )
+    return result
+
+
 def _autocomplete(parser):
     try:
         import argcomplete
@@ -210,6 +237,29 @@ def _get_parser(subparsers=None):
         default=BLOCKSIZE // MB,
         help="httpio block size in MB (default: %(default)d)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=MAX_WORKERS,
+        help="maximum number of products downloaded in parallel "
+        "(default: %(default)d)",
+    )
+    parser.add_argument(
+        "--client",
+        choices=CLIENT_IMPLEMENTATIONS,
+        help="client implementation used to access remote archives. "
+        "The 'fsspec' client is based on asyncio and aiohttp. "
+        "By default the one specified by the 'ASFSMD_CLIENT' environment "
+        "variable or the first one available is used.",
+    )
+    parser.add_argument(
+        "--no-blob-cache",
+        dest="blob_cache",
+        action="store_false",
+        help="do not store extracted files in the local blob cache and "
+        "do not restore them from it.",
+    )
 
     # Optional filters
     parser.add_argument(
@@ -326,6 +376,9 @@ def main(*argv):
             file_list=args.file_list,
             block_size=args.block_size * MB,
             noprogress=args.noprogress,
+            jobs=args.jobs,
+            client=args.client,
+            blob_cache=args.blob_cache,
             username=args.username,
             password=args.password,
         )
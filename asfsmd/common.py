@@ -2,10 +2,21 @@
 
 import os
 import abc
-from typing import NamedTuple, Union
+import zipfile
+from typing import Iterable, NamedTuple, Tuple, Union
 
 MB = 1024 * 1024
 BLOCKSIZE = 16 * MB  # 16MB (64MB is a better choice to download data)
+MAX_WORKERS = 8  # number of products downloaded concurrently
+MAX_COMPONENT_WORKERS = 4  # number of components extracted concurrently
+TAILSIZE = 128 * 1024  # size of the archive tail loaded when it is opened
+COALESCE_GAP = 256 * 1024  # max gap between ranges fetched in one request
+BLOB_MAX_SIZE = 16 * MB  # max size of components stored in the blob cache
+BLOB_CACHE_MAX_SIZE = 1024 * MB  # max total size of the blob cache
+TAIL_CACHE_MAX_SIZE = 1024 * MB  # max total size of the archive tail cache
+QUERY_CHUNK_SIZE = 50  # number of products per ASF search request
+MAX_QUERY_WORKERS = 4  # number of ASF search requests issued concurrently
+QUERY_CACHE_TTL = 24 * 3600  # validity of cached query results [s]
 
 
 # @COMPATIBILITY: requires Python >= 3.9
@@ -24,6 +35,11 @@ class Auth(NamedTuple):
 class AbstractClient(abc.ABC):
     """Base asfsmd client class."""
 
+    #: True if the components of an archive can be read concurrently
+    #: (by multiple threads) through the same ZipFile object, safely and
+    #: without downloading the same data more than once
+    concurrent_reads: bool = False
+
     def __enter__(self):  # noqa: D105
         return self
 
@@ -34,3 +50,11 @@ class AbstractClient(abc.ABC):
     def open_zip_archive(self, url: Url):
         """Context manager for the remote zip archive."""
         pass
+
+    def prefetch(self, zf: zipfile.ZipFile, ranges: Iterable[Tuple[int, int]]):
+        """Pre-load the specified byte ranges of the remote zip archive.
+
+        This is only an optimization hint, and the default implementation
+        does nothing.
+        """
+        pass
@@ -1,7 +1,15 @@
 """Core functions for the ASF Sentinel-1 Metadata Download tool."""
 
 import os
+import re
+import json
+import stat
+import time
+import zlib
+import errno
 import netrc
+import queue
+import shutil
 import fnmatch
 import hashlib
 import logging
@@ -10,14 +18,40 @@ import zipfile
 import warnings
 import functools
 import importlib
-from typing import List, Optional
+import itertools
+import threading
+import concurrent.futures
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Pattern,
+    Iterable,
+    Optional,
+    Sequence,
+)
 from xml.etree import ElementTree as etree  # noqa: N813
 from urllib.parse import urlparse
 
 import tqdm
-import asf_search as asf
 
-from .common import Auth, BLOCKSIZE, PathType, Url
+from ._utils import get_cache_dir, prune_cache, write_bytes_atomic
+from .common import (
+    MAX_WORKERS,
+    MAX_COMPONENT_WORKERS,
+    COALESCE_GAP,
+    BLOB_MAX_SIZE,
+    BLOB_CACHE_MAX_SIZE,
+    QUERY_CHUNK_SIZE,
+    MAX_QUERY_WORKERS,
+    QUERY_CACHE_TTL,
+    Auth,
+    BLOCKSIZE,
+    PathType,
+    Url,
+    AbstractClient,
+)
 
 __all__ = [
     "download_annotations",
@@ -29,10 +63,13 @@ __all__ = [
 _log = logging.getLogger(__name__)
 
 
-def _get_client_type():
-    implementations = ["httpio", "fsspec", "remotezip"]
-    if os.environ.get("ASFSMD_CLIENT") in implementations:
-        name = os.environ.get("ASFSMD_CLIENT")
+CLIENT_IMPLEMENTATIONS = ["httpio", "fsspec", "remotezip", "smart_open"]
+
+
+@functools.lru_cache()
+def _load_client_type(name: Optional[str] = None):
+    implementations = CLIENT_IMPLEMENTATIONS
+    if name in implementations:
         name = f".{name}_client"
         mod = importlib.import_module(name, package=__package__)
     else:
@@ -51,18 +88,51 @@ def _get_client_type():
                 f"{','.join(map(repr, implementations))}"
             )
 
-    _log.debug(f"Client: {mod.Client}")
+    _log.debug("Client: %s", mod.Client)
     return mod.Client
 
 
-_ClientType = _get_client_type()
+def _get_client_type(name: Optional[str] = None):
+    """Return the client class.
+
+    Client modules are imported on first use, and the result is cached.
+    """
+    if name is None:
+        name = os.environ.get("ASFSMD_CLIENT")
+    return _load_client_type(name)
+
+
+def __getattr__(name):
+    # backward compatibility: the default client type used to be
+    # computed at import time
+    if name == "_ClientType":
+        return _get_client_type()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def query(products):
     """Query the specified Sentinel-1 products."""
+    # asf_search is slow to import and it is only needed here
+    import asf_search as asf
+
     if isinstance(products, str):
         products = [products]
-    results = asf.granule_search(products)
+    chunks = [
+        products[idx : idx + QUERY_CHUNK_SIZE]
+        for idx in range(0, len(products), QUERY_CHUNK_SIZE)
+    ]
+    if len(chunks) > 1:
+        # executor.map preserves the order of the chunks
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_QUERY_WORKERS
+        ) as executor:
+            results = list(
+                itertools.chain.from_iterable(
+                    executor.map(asf.granule_search, chunks)
+                )
+            )
+    else:
+        results = asf.granule_search(products)
     results = [
         result
         for result in results
@@ -71,6 +141,63 @@ def query(products):
     return results
 
 
+def _load_query_cache(path: pathlib.Path) -> Dict[str, Tuple[Url, float]]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    now = time.time()
+    cache = {}
+    for name, entry in data.items():
+        # skip malformed entries
+        if not (
+            isinstance(entry, list)
+            and len(entry) == 2
+            and isinstance(entry[0], str)
+            and isinstance(entry[1], (int, float))
+        ):
+            continue
+        url, timestamp = entry
+        if now - timestamp < QUERY_CACHE_TTL:
+            cache[name] = (url, timestamp)
+    return cache
+
+
+def _query_urls(products: List[str]) -> Dict[str, Url]:
+    """Return a dictionary mapping product names into download URLs.
+
+    Results are cached on disk (see :func:`asfsmd._utils.get_cache_dir`)
+    for QUERY_CACHE_TTL seconds, so only products that have not been
+    recently queried are searched on the remote server.
+    """
+    cache_dir = get_cache_dir()
+    cache_path = cache_dir / "queries.json" if cache_dir else None
+    cache = _load_query_cache(cache_path) if cache_path else {}
+
+    missing = [name for name in products if name not in cache]
+    if missing:
+        now = time.time()
+        for result in query(missing):
+            name = result.properties["sceneName"]
+            cache[name] = (result.properties["url"], now)
+        if cache_path:
+            try:
+                write_bytes_atomic(cache_path, json.dumps(cache).encode())
+            except OSError:
+                _log.debug("unable to store %s", cache_path, exc_info=True)
+
+    urls = {name: cache[name][0] for name in products if name in cache}
+    if len(urls) != len(products):
+        warnings.warn(
+            f"only {len(urls)} of the {len(products)} requested products "
+            f"found on the remote server"
+        )
+    return urls
+
+
+@functools.lru_cache(maxsize=64)
 def make_patterns(
     beam: Optional[str] = "*",
     pol: Optional[str] = "??",
@@ -78,11 +205,12 @@ def make_patterns(
     noise: bool = False,
     rfi: bool = False,
     data: bool = False,
-) -> List[str]:
+) -> Tuple[str, ...]:
     """Generate a list of patterns according to the specified options.
 
     Patterns are used to match components in the ZIP archive of the
     Sentinel-1 products.
+    Results are cached and returned as (immutable) tuples.
     """
     beam = "*" if beam is None else beam
     pol = "??" if pol is None else pol
@@ -106,73 +234,284 @@ def make_patterns(
         patterns.append(f"S1*.SAFE/measurement/s1?-{beam}-???-{pol}-*.tiff")
         patterns.append(f"S1*.SAFE/s1?-{beam}-???-?-{pol}-*.dat")
 
-    return patterns
+    return tuple(patterns)
+
+
+def _file_digest(
+    path: pathlib.Path, name: str, block_size: Optional[int] = BLOCKSIZE
+):
+    """Compute the hash of a file without allocating a buffer per block."""
+    with path.open("rb") as fd:
+        if hasattr(hashlib, "file_digest"):  # Python >= 3.11
+            return hashlib.file_digest(fd, name)
+
+        # @COMPATIBILITY: Python < 3.11
+        digest = hashlib.new(name)
+        buf = memoryview(bytearray(block_size or BLOCKSIZE))
+        for size in iter(functools.partial(fd.readinto, buf), 0):
+            digest.update(buf[:size])
+        return digest
+
+
+def _get_verified_path(
+    verified_dir: pathlib.Path, path: pathlib.Path
+) -> pathlib.Path:
+    key = os.fspath(path.resolve()).encode("utf-8")
+    return verified_dir / f"{hashlib.sha1(key).hexdigest()}.json"
+
+
+def _load_verified(path: pathlib.Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _load_inventory(data: Any) -> Optional[List[Tuple[str, int, str, str]]]:
+    """Return the manifest inventory stored in the verification state.
+
+    None is returned if `data` is not a valid inventory.
+    """
+    if not isinstance(data, list):
+        return None
+    inventory = []
+    for item in data:
+        if not (
+            isinstance(item, list)
+            and len(item) == 4
+            and isinstance(item[1], int)
+            and all(isinstance(item[idx], str) for idx in (0, 2, 3))
+        ):
+            return None
+        inventory.append(tuple(item))
+    return inventory
+
+
+def _stat_file(path: pathlib.Path) -> Optional[os.stat_result]:
+    """Return the stat of a regular file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _parse_manifest(path: pathlib.Path) -> List[Tuple[str, int, str, str]]:
+    """Return the (href, size, checksum type, checksum) of components.
+
+    The manifest is parsed incrementally and data objects are discarded
+    as soon as they have been processed.
+    """
+    inventory = []
+    tags: List[str] = []
+    events = ("start", "end")
+    for event, elem in etree.iterparse(os.fspath(path), events=events):
+        if event == "start":
+            tags.append(elem.tag)
+            continue
+        if tags[1:] == ["dataObjectSection", "dataObject", "byteStream"]:
+            checksum_elem = elem.find("checksum")
+            inventory.append(
+                (
+                    elem.find("fileLocation").attrib["href"],
+                    int(elem.attrib["size"]),
+                    checksum_elem.attrib["checksumName"],
+                    checksum_elem.text,
+                )
+            )
+        elif tags[1:] == ["dataObjectSection", "dataObject"]:
+            elem.clear()
+        tags.pop()
+    return inventory
 
 
 def _is_product_complete(
     path: pathlib.Path,
-    patterns: Optional[List[str]] = None,
+    patterns: Optional[Sequence[str]] = None,
     block_size: Optional[int] = BLOCKSIZE,
+    verified_dir: Optional[pathlib.Path] = None,
 ) -> bool:
-    if not path.is_dir():
-        return False
-
+    """Check if all the components of the product are on disk.
+
+    The size and the MD5 checksum of the components are checked against
+    the ones declared in the product manifest.
+    If `verified_dir` is provided, the list of components declared in the
+    manifest and the size, modification time and checksum of verified
+    components are recorded in it.
+    The manifest is not parsed again, and components are not hashed
+    again, if their size and modification time did not change since the
+    last verification.
+    """
     manifest_path = path / "manifest.safe"
-    if not manifest_path.is_file():
+    manifest_stat = _stat_file(manifest_path)
+    if manifest_stat is None:
         return False
 
-    xmldoc = etree.parse(os.fspath(manifest_path))
-    for elem in xmldoc.iterfind("./dataObjectSection/dataObject/byteStream"):
-        relative_component_path = elem.find("fileLocation").attrib["href"]
-        relative_component_path = pathlib.Path(relative_component_path)
-        relative_component_path = relative_component_path.relative_to(".")
-
-        patterns = make_patterns() if not patterns else patterns
+    patterns = make_patterns() if not patterns else patterns
+    # use the same matching rules of _filter_components
+    regex = _compile_patterns(tuple(patterns))
+
+    verified_path = None
+    state: Dict[str, Any] = {}
+    if verified_dir is not None:
+        verified_path = _get_verified_path(verified_dir, path)
+        state = _load_verified(verified_path)
+
+    manifest_key = [manifest_stat.st_size, manifest_stat.st_mtime_ns]
+    manifest = state.get("manifest")
+    inventory = None
+    if isinstance(manifest, dict) and manifest.get("stat") == manifest_key:
+        inventory = _load_inventory(manifest.get("inventory"))
+    manifest_updated = inventory is None
+    if inventory is None:
+        inventory = _parse_manifest(manifest_path)
+
+    verified: Dict[str, Dict[str, Any]] = state.get("components", {})
+    if not isinstance(verified, dict):
+        verified = {}
+    unverified: List[Tuple[str, pathlib.Path, Dict[str, Any]]] = []
+    for href, size, checksum_type, checksum in inventory:
+        relative_component_path = pathlib.Path(href).relative_to(".")
 
         component_path = path.name / relative_component_path
-        for pattern in patterns:
-            if component_path.match(pattern):
-                # pattern matches: exit the current loop and continue
-                # in the current main iteration
-                break
-        else:
-            # skip the rest and go to the next main iteration
+        if not regex.match(component_path.as_posix()):
             continue
 
         component_path = path / relative_component_path
-        if not component_path.is_file():
+        component_stat = _stat_file(component_path)
+        if component_stat is None or component_stat.st_size != size:
             return False
 
-        size = int(elem.attrib["size"])
-        if component_path.stat().st_size != size:
-            return False
-
-        checksum_elem = elem.find("checksum")
-        checksum_type = checksum_elem.attrib["checksumName"]
         if checksum_type.upper() != "MD5":
             _log.warning("unexpected checksum type: %s", checksum_type)
             return False  # cannot check if the file is complete
-        md5 = hashlib.md5()
-        with path.joinpath(relative_component_path).open("rb") as fd:
-            for data in iter(functools.partial(fd.read, block_size), b""):
-                md5.update(data)
-        if md5.hexdigest() != checksum_elem.text:
-            return False
+
+        key = relative_component_path.as_posix()
+        record = {
+            "size": size,
+            "mtime_ns": component_stat.st_mtime_ns,
+            "md5": checksum,
+        }
+        if verified.get(key) != record:
+            unverified.append((key, component_path, record))
+
+    def check(item) -> bool:
+        _, component_path, record = item
+        md5 = _file_digest(component_path, "md5", block_size)
+        return md5.hexdigest() == record["md5"]
+
+    # hashlib releases the GIL, so components can be hashed in parallel
+    max_workers = min(len(unverified), os.cpu_count() or 1)
+    if max_workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            complete = all(executor.map(check, unverified))
+    else:
+        complete = all(map(check, unverified))
+    if not complete:
+        return False
+
+    for key, _, record in unverified:
+        verified[key] = record
+
+    if (unverified or manifest_updated) and verified_path is not None:
+        state = {
+            "manifest": {"stat": manifest_key, "inventory": inventory},
+            "components": verified,
+        }
+        try:
+            write_bytes_atomic(verified_path, json.dumps(state).encode())
+        except OSError:
+            _log.debug("unable to store %s", verified_path, exc_info=True)
 
     return True
 
 
+@functools.lru_cache()
+def _compile_patterns(patterns: Tuple[str, ...]) -> Pattern[str]:
+    """Compile a sequence of glob patterns into a single regex."""
+    if not patterns:
+        return re.compile("(?!)")  # never matches
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns)
+    )
+
+
 def _filter_components(
     zf: zipfile.ZipFile,
-    patterns: List[str],
+    patterns: Sequence[str],
 ) -> List[zipfile.ZipInfo]:
-    components = []
-    for info in zf.filelist:
-        for pattern in patterns:
-            if fnmatch.fnmatch(info.filename, pattern):
-                components.append(info)
-                break
-    return components
+    regex = _compile_patterns(tuple(patterns))
+    return [info for info in zf.filelist if regex.match(info.filename)]
+
+
+# The extra field of the local file header can be larger than the one
+# stored in the central directory (e.g. ZIP64 or extended timestamps)
+_EXTRA_FIELD_MARGIN = 64
+
+
+def _coalesce_ranges(
+    components: Iterable[zipfile.ZipInfo],
+    max_gap: int = COALESCE_GAP,
+) -> List[Tuple[int, int]]:
+    """Compute the byte ranges of the archive including all components.
+
+    Each range is a (start, stop) tuple covering the local file headers
+    and the compressed data of the components, so that each of them can
+    be extracted without any additional request.
+    Components closer than `max_gap` bytes are merged in a single range,
+    so that they can be retrieved with a single request.
+    """
+    ranges: List[Tuple[int, int]] = []
+    for info in sorted(components, key=lambda item: item.header_offset):
+        start = info.header_offset
+        stop = (
+            start
+            + zipfile.sizeFileHeader
+            + len(info.orig_filename.encode("utf-8"))
+            + len(info.extra)
+            + _EXTRA_FIELD_MARGIN
+            + info.compress_size
+        )
+        if ranges and start - ranges[-1][1] <= max_gap:
+            ranges[-1] = (ranges[-1][0], max(stop, ranges[-1][1]))
+        else:
+            ranges.append((start, stop))
+    return ranges
+
+
+def _pipelined_copy(src, dst, block_size: int = BLOCKSIZE, depth: int = 2):
+    """Copy data from src to dst overlapping reads and writes.
+
+    Blocks are read in the calling thread and written by a separate
+    thread, with at most `depth` blocks pending in between.
+    """
+    blocks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=depth)
+    failed = threading.Event()
+
+    def write():
+        try:
+            for data in iter(blocks.get, None):
+                dst.write(data)
+        except BaseException:
+            # stop the reader and keep consuming blocks so that it never
+            # gets stuck on a full queue
+            failed.set()
+            for _ in iter(blocks.get, None):
+                pass
+            raise
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(write)
+        try:
+            while not failed.is_set():
+                data = src.read(block_size)
+                if not data or failed.is_set():
+                    break
+                blocks.put(data)
+        finally:
+            blocks.put(None)
+        future.result()
 
 
 def _download(
@@ -182,96 +521,319 @@ def _download(
     block_size: int = BLOCKSIZE,
     noprogress: bool = False,
 ):
-    size = info.file_size
+    if info.file_size <= block_size:
+        # small components are decompressed in one shot, without
+        # per-file progress bar
+        data = zf.read(info)
+        with open(outfile, "wb") as dst:
+            dst.write(data)
+    else:
+        with zf.open(info) as src, open(outfile, "wb") as dst:
+            with tqdm.tqdm.wrapattr(
+                src,
+                "read",
+                total=info.file_size,
+                leave=False,
+                unit_scale=True,
+                disable=noprogress,
+            ) as reader:
+                _pipelined_copy(reader, dst, block_size)
+    _log.debug("%r extracted", info.filename)
+
+
+def _crc32(path: pathlib.Path, block_size: int = BLOCKSIZE) -> int:
+    crc = 0
+    with path.open("rb") as fd:
+        for data in iter(functools.partial(fd.read, block_size), b""):
+            crc = zlib.crc32(data, crc)
+    return crc
+
+
+def _link_or_copy(src: pathlib.Path, dst: pathlib.Path):
+    try:
+        os.link(src, dst)
+    except OSError as exc:
+        # hard links are not possible across file systems or on file
+        # systems that do not support them
+        if exc.errno not in (errno.EXDEV, errno.EPERM):
+            raise
+        shutil.copyfile(src, dst)
+
+
+def _get_blob_path(blob_dir: pathlib.Path, info: zipfile.ZipInfo):
+    name = pathlib.PurePosixPath(info.filename).name
+    return blob_dir / f"{info.CRC:08x}-{info.file_size}-{name}"
+
+
+def _restore_blob(
+    blob_dir: pathlib.Path, info: zipfile.ZipInfo, outfile: pathlib.Path
+) -> bool:
+    """Restore outfile from the blob cache if available."""
+    if info.file_size > BLOB_MAX_SIZE:
+        return False
+    blob_path = _get_blob_path(blob_dir, info)
+    try:
+        if _crc32(blob_path) != info.CRC:
+            return False
+        _link_or_copy(blob_path, outfile)
+        # record the access (preserving mtime) for the LRU eviction
+        os.utime(blob_path, ns=(time.time_ns(), blob_path.stat().st_mtime_ns))
+    except OSError:
+        return False
+    _log.debug("%r restored from %r", info.filename, os.fspath(blob_path))
+    return True
+
+
+def _store_blob(
+    blob_dir: pathlib.Path, info: zipfile.ZipInfo, outfile: pathlib.Path
+):
+    """Store outfile in the blob cache."""
+    if info.file_size > BLOB_MAX_SIZE:
+        return
+    blob_path = _get_blob_path(blob_dir, info)
+    try:
+        blob_dir.mkdir(parents=True, exist_ok=True)
+        if not blob_path.exists():
+            _link_or_copy(outfile, blob_path)
+    except OSError:
+        _log.debug("unable to store %r", os.fspath(blob_path), exc_info=True)
+
+
+def _extract(
+    zf: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    outfile: pathlib.Path,
+    *,
+    blob_dir: Optional[pathlib.Path] = None,
+    block_size: int = BLOCKSIZE,
+    noprogress: bool = False,
+):
+    _download(zf, info, outfile, block_size=block_size, noprogress=noprogress)
+    if blob_dir is not None:
+        _store_blob(blob_dir, info, outfile)
+
+
+class _LazyClient(AbstractClient):
+    """Client proxy that instantiates the actual client on first use.
+
+    It allows to skip the import and the initialization of the client
+    (e.g. the set-up of HTTP sessions) when all the requested products
+    are already on disk.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> AbstractClient:
+        with self._lock:
+            if self._client is None:
+                self._client = self._factory().__enter__()
+            return self._client
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        if self._client is not None:
+            self._client.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def concurrent_reads(self) -> bool:  # type: ignore[override]
+        """True if the actual client supports concurrent reads."""
+        return self._get_client().concurrent_reads
+
+    def open_zip_archive(self, url: Url):
+        """Context manager for the remote zip archive."""
+        return self._get_client().open_zip_archive(url)
+
+    def prefetch(self, zf: zipfile.ZipFile, ranges: Iterable[Tuple[int, int]]):
+        """Pre-load the specified byte ranges of the remote zip archive."""
+        return self._get_client().prefetch(zf, ranges)
+
+
+def _wait_for(futures: Dict[concurrent.futures.Future, str], **kwargs):
+    """Wait for the completion of all futures showing a progress bar.
+
+    The progress bar description is set to the label of the last
+    completed future (the display is refreshed at the tqdm rate).
+    Pending futures are cancelled as soon as one of them fails.
+    """
     with tqdm.tqdm(
-        total=size, leave=False, unit_scale=True, unit="B", disable=noprogress
+        concurrent.futures.as_completed(futures), total=len(futures), **kwargs
     ) as pbar:
-        with zf.open(info) as src, open(outfile, "wb") as dst:
-            for data in iter(functools.partial(src.read, block_size), b""):
-                dst.write(data)
-                pbar.update(len(data))
+        try:
+            for future in pbar:
+                pbar.set_description(futures[future], refresh=False)
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _download_product(
+    client,
+    url: Url,
+    *,
+    patterns: Sequence[str],
+    outdir: pathlib.Path,
+    blob_dir: Optional[pathlib.Path] = None,
+    verified_dir: Optional[pathlib.Path] = None,
+    block_size: int = BLOCKSIZE,
+    noprogress: bool = False,
+):
+    product_out_path = outdir / pathlib.Path(urlparse(url).path).name
+    product_out_path = product_out_path.with_suffix(".SAFE")
+    product_name = product_out_path.stem
+    if _is_product_complete(
+        product_out_path, patterns, block_size, verified_dir
+    ):
+        _log.debug("product already on disk: %r", product_name)
+        return
+    else:
+        _log.debug("download: %r", product_name)
+
+    with client.open_zip_archive(url) as zf:
+        _log.debug("%s open", url)
+        components = []
+        for info in _filter_components(zf, patterns):
+            outfile = outdir.joinpath(info.filename)
+            if outfile.exists():
+                _log.debug("outfile = %r exists", outfile)
+            else:
+                components.append((info, outfile))
+
+        # Create each target directory only once
+        for targetdir in {outfile.parent for _, outfile in components}:
+            _log.debug("targetdir = %r", targetdir)
+            targetdir.mkdir(exist_ok=True, parents=True)
+
+        if blob_dir is not None:
+            components = [
+                (info, outfile)
+                for info, outfile in components
+                if not _restore_blob(blob_dir, info, outfile)
+            ]
+
+        client.prefetch(zf, _coalesce_ranges(info for info, _ in components))
+
+        # Reads from the (remote) archive are serialized by the lock of
+        # the ZipFile object, while decompression and writing of each
+        # component can overlap with the download of the others.
+        # The lock does not protect the internal state of all the remote
+        # file implementations (e.g. remotezip), and interleaved reads
+        # defeat the readahead of others (e.g. fsspec), so components are
+        # extracted sequentially unless the client supports it.
+        max_workers = MAX_COMPONENT_WORKERS if client.concurrent_reads else 1
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _extract,
+                    zf,
+                    info,
+                    outfile,
+                    blob_dir=blob_dir,
+                    block_size=block_size,
+                    noprogress=noprogress,
+                ): outfile.name
+                for info, outfile in components
+            }
+            _wait_for(futures, unit="files", leave=False, disable=noprogress)
 
 
 def download_components_from_urls(
-    urls,
+    urls: Iterable[Url],
     *,
-    patterns: Optional[List[str]] = None,
+    patterns: Optional[Sequence[str]] = None,
     outdir: PathType = ".",
     auth: Optional[Auth] = None,
     block_size: int = BLOCKSIZE,
     noprogress: bool = False,
+    max_workers: int = MAX_WORKERS,
+    client: Optional[str] = None,
+    blob_cache: bool = True,
 ):
-    """Download Sentinel-1 annotation for the specified product urls."""
+    """Download Sentinel-1 annotation for the specified product urls.
+
+    Products are downloaded concurrently using up to `max_workers`
+    threads that share the same client (and the same HTTP session).
+    `urls` can be any iterable, including lazy ones: each download is
+    scheduled as soon as the corresponding URL is produced.
+
+    The `client` parameter can be used to select a specific client
+    implementation (see `CLIENT_IMPLEMENTATIONS`), by default the one
+    specified by the `ASFSMD_CLIENT` environment variable or the first
+    available one is used.
+
+    Extracted annotation files are also stored in the "blobs" folder of
+    the cache directory (see `get_cache_dir`), and restored from there
+    when the same components are requested again.
+    The least recently used blobs are removed when the total size of the
+    blob cache exceeds `BLOB_CACHE_MAX_SIZE`.
+    The blob cache can be disabled by setting `blob_cache` to False.
+    The result of the verification of products already on disk is cached
+    in the "verified" folder, so that unchanged files are not hashed
+    again.
+    """
     outdir = pathlib.Path(outdir)
     if patterns is None:
         patterns = make_patterns()
-
-    with _ClientType(auth=auth, block_size=block_size) as client:
-        url_iter = tqdm.tqdm(urls, unit=" products", disable=noprogress)
-        for url in url_iter:
-            url_iter.set_description(url)
-            product_out_path = outdir / pathlib.Path(urlparse(url).path).name
-            product_out_path = product_out_path.with_suffix(".SAFE")
-            product_name = product_out_path.stem
-            if _is_product_complete(product_out_path, patterns, block_size):
-                _log.debug("product already on disk: %r", product_name)
-                continue
-            else:
-                _log.debug("download: %r", product_name)
-
-            with client.open_zip_archive(url) as zf:
-                _log.debug("%s open", url)
-                components = _filter_components(zf, patterns)
-                component_iter = tqdm.tqdm(
-                    components, unit="files", leave=False, disable=noprogress
-                )
-                for info in component_iter:
-                    filename = pathlib.Path(info.filename)
-                    component_iter.set_description(filename.name)
-                    targetdir = outdir / filename.parent
-                    outfile = targetdir / filename.name
-                    _log.debug("targetdir = %r", targetdir)
-                    _log.debug("outfile = %r", outfile)
-                    targetdir.mkdir(exist_ok=True, parents=True)
-                    if outfile.exists():
-                        _log.debug("outfile = %r exists", outfile)
-                    else:
-                        _download(
-                            zf,
-                            info,
-                            outfile,
-                            block_size=block_size,
-                            noprogress=noprogress,
-                        )
-                        _log.debug("%r extracted", info.filename)
+    cache_dir = get_cache_dir()
+    blob_dir = (
+        cache_dir / "blobs" if cache_dir is not None and blob_cache else None
+    )
+    verified_dir = cache_dir / "verified" if cache_dir is not None else None
+
+    def client_factory():
+        client_type = _get_client_type(client)
+        return client_type(auth=auth, block_size=block_size)
+
+    with _LazyClient(client_factory) as remote_client:
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _download_product,
+                    remote_client,
+                    url,
+                    patterns=patterns,
+                    outdir=outdir,
+                    blob_dir=blob_dir,
+                    verified_dir=verified_dir,
+                    block_size=block_size,
+                    noprogress=noprogress,
+                ): pathlib.PurePosixPath(urlparse(url).path).stem
+                for url in urls
+            }
+            _wait_for(futures, unit=" products", disable=noprogress)
+
+    if blob_dir is not None:
+        prune_cache(blob_dir, BLOB_CACHE_MAX_SIZE)
 
 
 def download_annotations(
     products: List[str],
     *,
-    patterns: Optional[List[str]] = None,
+    patterns: Optional[Sequence[str]] = None,
     outdir: PathType = ".",
     auth: Optional[Auth] = None,
     block_size: Optional[int] = BLOCKSIZE,
     noprogress: bool = False,
+    max_workers: int = MAX_WORKERS,
+    client: Optional[str] = None,
+    blob_cache: bool = True,
 ):
     """Download annotations for the specified Sentinel-1 products."""
-    results = query(products)
-    if len(results) != len(products):
-        warnings.warn(
-            f"only {len(results)} of the {len(products)} requested products "
-            f"found on the remote server"
-        )
-
-    urls = [item.properties["url"] for item in results]
+    urls = _query_urls(products)
 
     download_components_from_urls(
-        urls,
+        list(urls.values()),
         patterns=patterns,
         outdir=outdir,
         auth=auth,
         block_size=block_size if block_size is not None else BLOCKSIZE,
         noprogress=noprogress,
+        max_workers=max_workers,
+        client=client,
+        blob_cache=blob_cache,
     )
 
 
@@ -7,7 +7,7 @@ from typing import Iterator, Optional
 import fsspec
 import aiohttp
 
-from .common import AbstractClient, Auth, Url
+from .common import TAILSIZE, AbstractClient, Auth, Url
 
 
 class FsspacClient(AbstractClient):
@@ -30,6 +30,12 @@ class FsspacClient(AbstractClient):
     def open_zip_archive(self, url: Url) -> Iterator[zipfile.ZipFile]:
         """Context manager for the remote zip archive."""
         with self._fs.open(url, "rb") as fd:
+            # Load the end of the archive with a single request, so that
+            # the central directory is then read from the file cache
+            if fd.size is not None:
+                fd.seek(max(fd.size - TAILSIZE, 0))
+                fd.read()
+                fd.seek(0)
             with zipfile.ZipFile(fd) as zf:
                 yield zf
 
@@ -1,27 +1,148 @@
 """Asfsmd client based on httpio and requests."""
 
+import io
+import os
+import time
+import hashlib
+import logging
+import pathlib
 import zipfile
 import contextlib
-from typing import IO, Iterator, Optional
+import collections
+from typing import IO, Tuple, Iterable, Iterator, Optional
 
 import httpio
 import requests
 
-from .common import AbstractClient, Auth, BLOCKSIZE, Url
+from ._utils import (
+    make_session,
+    get_cache_dir,
+    prune_cache,
+    write_bytes_atomic,
+)
+from .common import (
+    MB,
+    TAILSIZE,
+    TAIL_CACHE_MAX_SIZE,
+    AbstractClient,
+    Auth,
+    BLOCKSIZE,
+    MAX_COMPONENT_WORKERS,
+    PathType,
+    Url,
+)
+
+_log = logging.getLogger(__name__)
+
+CACHESIZE = 64 * MB
+
+
+class _BlockCache(collections.OrderedDict):
+    """Dictionary of data blocks with least recently used eviction.
+
+    Eviction only happens when `trim` is called, so that blocks inserted
+    during a single read operation are never discarded before use.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+
+    def trim(self):
+        """Discard the least recently used blocks exceeding maxsize."""
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _get_tail_cache_dir(cache_dir: PathType) -> pathlib.Path:
+    """Return the path of the archive tail cache in cache_dir."""
+    return pathlib.Path(cache_dir) / "tails"
 
 
 class HttpIOFile(httpio.SyncHTTPIOFile):
-    """Class to represent an file-like object accessed via HTTP."""
+    """Class to represent an file-like object accessed via HTTP.
+
+    The last `tail_size` bytes of the file, where the ZIP end of central
+    directory record and (usually) the entire central directory are
+    located, are retrieved by the same request used to open the file
+    and all the subsequent reads in that region are served from memory.
+    If `cache_dir` is provided, the file length and the tail data starting
+    from the central directory are also stored on disk (in the "tails"
+    folder) and re-used next time the same URL is opened, without any
+    HTTP request.
+
+    At least two blocks are kept for each one of the `max_readers`
+    concurrent readers, so that the partially consumed block of a stream
+    is not evicted by the reads of the others.
+    After each read the block cache holds at most
+    ``max(cache_size, 2 * max_readers * block_size)`` bytes, i.e. the
+    cache grows beyond `cache_size` if needed to fit the requested block
+    size (128MB with the default 16MB block size and 4 readers).
+    """
+
+    def __init__(
+        self,
+        url: Url,
+        block_size: int = -1,
+        tail_size: int = TAILSIZE,
+        cache_size: int = CACHESIZE,
+        cache_dir: Optional[PathType] = None,
+        max_readers: int = 1,
+        **kwargs,
+    ):
+        """Initialize the HttpIOFile."""
+        super().__init__(url, block_size, **kwargs)
+        self.cache_dir = cache_dir
+        if block_size > 0:
+            self._cache = _BlockCache(
+                max(cache_size // block_size, 2 * max_readers)
+            )
+        self.tail_size = tail_size
+        self._tail = b""
+        self._tail_offset: Optional[int] = None
+        self._owns_session = False
 
     def open(self, session: Optional[requests.Session] = None):  # noqa: A003
         """Open the remote file."""
         self._assert_not_closed()
         if not self._closing and self._session is None:
             self._session: requests.Session
-            self._session = requests.Session() if session is None else session
-            response = self._session.get(self.url, stream=True, **self._kwargs)
+            self._session = make_session() if session is None else session
+            self._owns_session = session is None
+            if self._load_tail():
+                return self
+
+            kwargs = dict(self._kwargs)
+            headers = dict(kwargs.pop("headers", {}))
+            if self.tail_size > 0:
+                headers["Range"] = f"bytes=-{self.tail_size}"
+            response = self._session.get(
+                self.url, stream=True, headers=headers, **kwargs
+            )
             with response:
                 response.raise_for_status()
+                if response.status_code == 206:
+                    content_range = response.headers.get("Content-Range", "")
+                    try:
+                        self.length = int(content_range.rsplit("/", 1)[1])
+                    except (IndexError, ValueError):
+                        raise httpio.HTTPIOError(
+                            "Server does not report content length"
+                        )
+                    self._tail = response.content
+                    self._tail_offset = self.length - len(self._tail)
+                    self._store_tail()
+                    return self
+
                 try:
                     self.length = int(response.headers["Content-Length"])
                 except KeyError:
@@ -35,25 +156,157 @@ class HttpIOFile(httpio.SyncHTTPIOFile):
                     )
         return self
 
+    def _get_tail_cache_path(self) -> Optional[pathlib.Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(self.url.encode("utf-8")).hexdigest()
+        return _get_tail_cache_dir(self.cache_dir) / f"{digest}.bin"
+
+    def _load_tail(self) -> bool:
+        path = self._get_tail_cache_path()
+        if path is None or not path.is_file():
+            return False
+        try:
+            data = path.read_bytes()
+            # record the access (preserving mtime) for the LRU eviction
+            os.utime(path, ns=(time.time_ns(), path.stat().st_mtime_ns))
+        except OSError:
+            return False
+        if len(data) <= 8:
+            return False
+        self.length = int.from_bytes(data[:8], "little")
+        self._tail = data[8:]
+        self._tail_offset = self.length - len(self._tail)
+        _log.debug("tail of %r loaded from %r", self.url, os.fspath(path))
+        return True
+
+    def _store_tail(self):
+        path = self._get_tail_cache_path()
+        if path is None:
+            return
+        # only the central directory and the following records are needed
+        # to open the archive
+        tail = self._tail
+        try:
+            endrec = zipfile._EndRecData(io.BytesIO(tail))
+        except (OSError, zipfile.BadZipFile):
+            endrec = None
+        if endrec is not None:
+            start = endrec[zipfile._ECD_OFFSET] - self._tail_offset
+            if 0 <= start < len(tail):
+                tail = tail[start:]
+        data = self.length.to_bytes(8, "little") + tail
+        try:
+            write_bytes_atomic(path, data)
+        except OSError:
+            _log.debug("unable to store %r", os.fspath(path), exc_info=True)
+
+    def close(self):
+        """Close the remote file and release the cached data.
+
+        The HTTP session is closed only if it has been created by the
+        file itself, sessions passed to `open` can be shared with other
+        files and are left open.
+        """
+        self._tail = b""
+        self._tail_offset = None
+        if not self._owns_session:
+            self._session = None
+        super().close()
+
+    def _read_cached(self, size, max_raw_reads=-1):
+        if self._tail_offset is not None and self._cursor >= self._tail_offset:
+            # serve reads in the tail region without touching the blocks,
+            # which would require to fetch the rest of the last block
+            offset = self._cursor - self._tail_offset
+            return [self._tail[offset : offset + size]]
+        data = super()._read_cached(size, max_raw_reads)
+        self._cache.trim()
+        return data
+
+    def _read_raw(self, start: int, end: int) -> bytes:
+        if self._tail_offset is None or end <= self._tail_offset:
+            return super()._read_raw(start, end)
+        tail = self._tail[
+            max(start - self._tail_offset, 0) : end - self._tail_offset
+        ]
+        if start >= self._tail_offset:
+            return tail
+        return super()._read_raw(start, self._tail_offset) + tail
+
+    def prefetch(self, ranges: Iterable[Tuple[int, int]]):
+        """Load the specified byte ranges into the block cache.
+
+        Contiguous blocks not already in cache are retrieved with a single
+        HTTP request.
+        Ranges whose blocks would no longer fit into the block cache are
+        skipped, so that prefetched blocks are never evicted before use.
+        """
+        if self.block_size <= 0:
+            return
+        blocks = set()
+        pos = self.tell()
+        try:
+            for start, stop in ranges:
+                if self._tail_offset is not None:
+                    stop = min(stop, self._tail_offset)
+                if stop <= start:
+                    continue
+                new_blocks = blocks.union(
+                    range(
+                        start // self.block_size,
+                        (stop - 1) // self.block_size + 1,
+                    )
+                )
+                if len(new_blocks) > self._cache.maxsize:
+                    continue
+                blocks = new_blocks
+                self.seek(start)
+                self.read(stop - start)
+        finally:
+            self.seek(pos)
+
 
 class HttpIOClient(AbstractClient):
     """HttpIO based asfsmd client."""
 
-    def __init__(self, auth: Auth, block_size: int = BLOCKSIZE):
-        """Initialize the httpio based client."""
-        self._session = requests.Session()
-        self._session.auth = auth
+    # reads are serialized by the lock of the ZipFile object and the
+    # block cache keeps the partially consumed blocks of each reader
+    concurrent_reads = True
+
+    def __init__(
+        self,
+        auth: Auth,
+        block_size: int = BLOCKSIZE,
+        max_readers: int = MAX_COMPONENT_WORKERS,
+    ):
+        """Initialize the httpio based client.
+
+        `max_readers` is the number of components of each archive that
+        are read concurrently (see `asfsmd.core._download_product`).
+        """
+        self._session = make_session(auth)
         self._block_size = block_size
+        self._max_readers = max_readers
+        self._cache_dir = get_cache_dir()
 
     def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
         self._session.close()
+        if self._cache_dir is not None:
+            tail_cache_dir = _get_tail_cache_dir(self._cache_dir)
+            prune_cache(tail_cache_dir, TAIL_CACHE_MAX_SIZE)
 
     def open(self, url: Url, mode: str = "rb") -> IO[bytes]:  # noqa: A003
         """Open a remote file."""
         if mode != "rb":
             raise ValueError("invalid mode: {mode!r}")
 
-        remote_file = HttpIOFile(url, block_size=self._block_size)
+        remote_file = HttpIOFile(
+            url,
+            block_size=self._block_size,
+            cache_dir=self._cache_dir,
+            max_readers=self._max_readers,
+        )
         return remote_file.open(session=self._session)
 
     @contextlib.contextmanager
@@ -63,5 +316,9 @@ class HttpIOClient(AbstractClient):
             with zipfile.ZipFile(fd) as zf:
                 yield zf
 
+    def prefetch(self, zf: zipfile.ZipFile, ranges: Iterable[Tuple[int, int]]):
+        """Pre-load the specified byte ranges of the remote zip archive."""
+        zf.fp.prefetch(ranges)
+
 
 Client = HttpIOClient
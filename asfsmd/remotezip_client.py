@@ -2,9 +2,9 @@
 
 import zipfile
 
-import requests
 import remotezip
 
+from ._utils import make_session
 from .common import AbstractClient, Auth, BLOCKSIZE, Url
 
 
@@ -13,8 +13,7 @@ class RemoteZipCLient(AbstractClient):
 
     def __init__(self, auth: Auth, block_size: int = BLOCKSIZE):
         """Initialize the remotezip based client."""
-        self._session = requests.Session()
-        self._session.auth = auth
+        self._session = make_session(auth)
         self._block_size = block_size
 
     def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
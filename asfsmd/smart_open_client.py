@@ -6,6 +6,7 @@ from typing import Any, Dict, Iterator, Optional
 
 import smart_open
 
+from ._utils import make_session
 from .common import AbstractClient, Auth, Url
 
 
@@ -14,18 +15,24 @@ class SmartOpenClient(AbstractClient):
 
     def __init__(self, auth: Auth, block_size: Optional[int] = None):
         """Initialize the smartopen based client."""
-        client_kwargs: Dict[str, Any] = {}
+        self._session = make_session(auth)
+        transport_params: Dict[str, Any] = {"session": self._session}
         if auth is not None:
-            client_kwargs["user"] = auth.user
-            client_kwargs["password"] = auth.pwd
+            transport_params["user"] = auth.user
+            transport_params["password"] = auth.pwd
         if block_size is not None:
-            client_kwargs["buffer_size"] = block_size
-        self.client_kwargs = client_kwargs if client_kwargs else None
+            transport_params["buffer_size"] = block_size
+        self.transport_params = transport_params
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        self._session.close()
 
     @contextlib.contextmanager
     def open_zip_archive(self, url: Url) -> Iterator[zipfile.ZipFile]:
         """Context manager for the remote zip archive."""
-        with smart_open.open(url, "rb", **self.client_kwargs) as fd:
+        with smart_open.open(
+            url, "rb", transport_params=self.transport_params
+        ) as fd:
             with zipfile.ZipFile(fd) as zf:
                 yield zf
 
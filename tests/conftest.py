@@ -0,0 +1,62 @@
+"""Fixtures shared by the asfsmd unit tests."""
+
+import re
+import threading
+import http.server
+
+import pytest
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serve the `data` of the server honouring the HTTP "Range" header."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):  # noqa: N802
+        self._send(body=False)
+
+    def do_GET(self):  # noqa: N802
+        self._send(body=True)
+
+    def _send(self, body: bool):
+        data = self.server.data
+        size = len(data)
+        range_ = self.headers.get("Range")
+        if range_ is None:
+            start, stop = 0, size - 1
+            self.send_response(200)
+        else:
+            start, stop = re.match(r"bytes=(\d*)-(\d*)", range_).groups()
+            if not start:
+                start, stop = max(size - int(stop), 0), size - 1
+            start, stop = int(start), min(int(stop or size - 1), size - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{stop}/{size}")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(stop + 1 - start))
+        self.end_headers()
+        if body:
+            with self.server.lock:
+                self.server.nbytes += stop + 1 - start
+            self.wfile.write(data[start : stop + 1])
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), RangeRequestHandler
+    )
+    server.daemon_threads = True
+    server.data = b""
+    server.nbytes = 0
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,10 +1,19 @@
 """Unit tests for the `asfsmd._utils` module."""
 
+import os
 import itertools
 
 import pytest
 
-from asfsmd._utils import unique, load_product_lists
+from asfsmd._utils import (
+    unique,
+    make_session,
+    prune_cache,
+    get_cache_dir,
+    strip_extension,
+    load_product_lists,
+    write_bytes_atomic,
+)
 
 
 @pytest.mark.parametrize(
@@ -25,6 +34,20 @@ def test_unique(in_, out):
     assert unique(in_) == out
 
 
+@pytest.mark.parametrize(
+    ["name", "expected"],
+    [
+        pytest.param("product", "product", id="no-ext"),
+        pytest.param("product.zip", "product", id="zip"),
+        pytest.param("product.SAFE", "product", id="SAFE"),
+        pytest.param("product.SAFE.zip", "product", id="SAFE.zip"),
+        pytest.param("product.zip.txt", "product.zip.txt", id="inner-ext"),
+    ],
+)
+def test_strip_extension(name, expected):
+    assert strip_extension(name) == expected
+
+
 @pytest.mark.parametrize(
     ["idata", "odata"],
     [
@@ -139,6 +162,17 @@ filelist02.txt
             },
             id="unique-with-comment",
         ),
+        pytest.param(
+            """\
+filelist01.txt  # trailing comment
+filelist02.txt# trailing comment
+filelist03.txt
+""",
+            {
+                "": ["filelist01.txt", "filelist02.txt", "filelist03.txt"],
+            },
+            id="unique-with-trailing-comment",
+        ),
         pytest.param(
             # NOTE: filename01.txt has trailing spaces
             (
@@ -265,3 +299,68 @@ def test__load_product_lists_multifile(jsondata, textdata, odata, tmp_path):
     textfile.write_text(textdata)
     data = load_product_lists(jsonfile, textfile)
     assert data == odata
+
+
+def test__load_product_lists_multifile_merge(tmp_path):
+    textfile = tmp_path / "textfile.txt"
+    textfile.write_text("filelist01.txt\n")
+    jsonfile1 = tmp_path / "jsonfile1.json"
+    jsonfile1.write_text('{"": ["filelist02.txt"], "a": ["a01.txt"]}')
+    jsonfile2 = tmp_path / "jsonfile2.json"
+    jsonfile2.write_text('["filelist01.txt", "filelist03.txt"]')
+    data = load_product_lists(textfile, jsonfile1, jsonfile2)
+    assert data == {
+        "": ["filelist01.txt", "filelist02.txt", "filelist03.txt"],
+        "a": ["a01.txt"],
+    }
+
+
+def test_make_session():
+    session = make_session(("user", "password"), pool_maxsize=4)
+    assert session.auth == ("user", "password")
+    for prefix in ("http://", "https://"):
+        adapter = session.get_adapter(prefix + "example.com")
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total > 0
+        assert 429 in adapter.max_retries.status_forcelist
+        assert adapter.max_retries.is_retry("GET", 503)
+        assert not adapter.max_retries.is_retry("POST", 503)
+
+
+def test_get_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", str(tmp_path))
+    assert get_cache_dir() == tmp_path
+
+
+def test_get_cache_dir_disabled(monkeypatch):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", "")
+    assert get_cache_dir() is None
+
+
+def test_get_cache_dir_xdg(monkeypatch, tmp_path):
+    monkeypatch.delenv("ASFSMD_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert get_cache_dir() == tmp_path / "asfsmd"
+
+
+def test_write_bytes_atomic(tmp_path):
+    path = tmp_path / "a" / "b" / "data.bin"
+    write_bytes_atomic(path, b"data")
+    assert path.read_bytes() == b"data"
+    write_bytes_atomic(path, b"new data")
+    assert path.read_bytes() == b"new data"
+    assert sorted(p.name for p in path.parent.iterdir()) == ["data.bin"]
+
+
+def test_prune_cache(tmp_path):
+    for idx in range(4):
+        blob_path = tmp_path / f"blob{idx}"
+        blob_path.write_bytes(b"x" * 100)
+        # blob0 is the least recently used one
+        os.utime(blob_path, (idx, idx))
+    prune_cache(tmp_path, max_size=250)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["blob2", "blob3"]
+
+
+def test_prune_cache_missing_dir(tmp_path):
+    prune_cache(tmp_path / "missing", max_size=0)
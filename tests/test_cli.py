@@ -3,48 +3,89 @@
 import pathlib
 from unittest import mock
 
+import pytest
+
 import asfsmd.core
-from asfsmd.cli import asfsmd_cli
+from asfsmd.cli import asfsmd_cli, _parse_args
 
 dummy_auth = asfsmd.core.Auth("user", "password")
 
 
+dummy_urls = {
+    "product01": "https://example.com/product01.zip",
+    "product02": "https://example.com/product02.zip",
+}
+
+
 @mock.patch("asfsmd.cli._get_auth", mock.Mock(return_value=dummy_auth))
-@mock.patch("asfsmd.cli.download_components_from_urls", mock.Mock())
-@mock.patch("asfsmd.cli.download_annotations")
-def test_asfsmd_cli_productlist(download_annotations):
+@mock.patch("asfsmd.cli._query_urls", mock.Mock(return_value=dummy_urls))
+@mock.patch("asfsmd.cli.download_components_from_urls")
+def test_asfsmd_cli_productlist(download_components_from_urls):
     product_list = ["product01", "product02"]
     asfsmd_cli(product_list, noprogress=True)
-    download_annotations.assert_called_once_with(
-        product_list,
+    download_components_from_urls.assert_called_once_with(
+        [dummy_urls[product] for product in product_list],
         outdir=pathlib.Path("."),
         auth=dummy_auth,
         patterns=asfsmd.core.make_patterns(),
         block_size=asfsmd.core.BLOCKSIZE,
         noprogress=True,
+        max_workers=asfsmd.core.MAX_WORKERS,
+        client=None,
+        blob_cache=True,
     )
 
 
 @mock.patch("asfsmd.cli._get_auth", mock.Mock(return_value=dummy_auth))
-@mock.patch("asfsmd.cli.download_components_from_urls", mock.Mock())
-@mock.patch("asfsmd.cli.download_annotations")
-def test_asfsmd_cli_filelist(download_annotations, tmp_path):
+@mock.patch("asfsmd.cli._query_urls", mock.Mock(return_value=dummy_urls))
+@mock.patch("asfsmd.cli.download_components_from_urls")
+def test_asfsmd_cli_filelist(download_components_from_urls, tmp_path):
     product_list = ["product01", "product02"]
     filelist = tmp_path.joinpath("filelist.txt")
     filelist.write_text("\n".join(product_list))
     asfsmd_cli([filelist], file_list=True, noprogress=True)
-    download_annotations.assert_called_once_with(
-        product_list,
+    download_components_from_urls.assert_called_once_with(
+        [dummy_urls[product] for product in product_list],
         outdir=pathlib.Path("."),
         auth=dummy_auth,
         patterns=asfsmd.core.make_patterns(),
         block_size=asfsmd.core.BLOCKSIZE,
         noprogress=True,
+        max_workers=asfsmd.core.MAX_WORKERS,
+        client=None,
+        blob_cache=True,
     )
 
 
 @mock.patch("asfsmd.cli._get_auth", mock.Mock(return_value=dummy_auth))
-@mock.patch("asfsmd.cli.download_annotations", mock.Mock())
+@mock.patch("asfsmd.cli._query_urls")
+@mock.patch("asfsmd.cli.download_components_from_urls")
+def test_asfsmd_cli_filelist_folders(
+    download_components_from_urls, query_urls, tmp_path
+):
+    query_urls.return_value = dummy_urls
+    filelist = tmp_path.joinpath("filelist.json")
+    filelist.write_text('{"a": ["product01"], "b": ["product02"]}')
+    asfsmd_cli([filelist], file_list=True, noprogress=True)
+
+    query_urls.assert_called_once_with(["product01", "product02"])
+    assert download_components_from_urls.call_count == 2
+    for folder, product in [("a", "product01"), ("b", "product02")]:
+        download_components_from_urls.assert_any_call(
+            [dummy_urls[product]],
+            outdir=pathlib.Path(folder),
+            auth=dummy_auth,
+            patterns=asfsmd.core.make_patterns(),
+            block_size=asfsmd.core.BLOCKSIZE,
+            noprogress=True,
+            max_workers=asfsmd.core.MAX_WORKERS,
+            client=None,
+            blob_cache=True,
+        )
+
+
+@mock.patch("asfsmd.cli._get_auth", mock.Mock(return_value=dummy_auth))
+@mock.patch("asfsmd.cli._query_urls", mock.Mock())
 @mock.patch("asfsmd.cli.download_components_from_urls")
 def test_asfsmd_cli_urls(download_components_from_urls):
     urls = ["url1", "url2"]
@@ -56,4 +97,46 @@ def test_asfsmd_cli_urls(download_components_from_urls):
         patterns=asfsmd.core.make_patterns(),
         block_size=asfsmd.core.BLOCKSIZE,
         noprogress=True,
+        max_workers=asfsmd.core.MAX_WORKERS,
+        client=None,
+        blob_cache=True,
     )
+
+
+@mock.patch("asfsmd.cli.download_components_from_urls", mock.Mock())
+def test_asfsmd_cli_positional_credentials():
+    with mock.patch(
+        "asfsmd.cli._get_auth", return_value=dummy_auth
+    ) as get_auth:
+        asfsmd_cli(
+            ["url1"],
+            "*",
+            "??",
+            False,
+            False,
+            False,
+            False,
+            ".",
+            True,
+            False,
+            asfsmd.core.BLOCKSIZE,
+            True,
+            "user",
+            "password",
+        )
+    get_auth.assert_called_once_with(user="user", pwd="password")
+
+
+def test_parse_args_no_blob_cache():
+    assert _parse_args(["product01"]).blob_cache is True
+    assert _parse_args(["--no-blob-cache", "product01"]).blob_cache is False
+
+
+def test_parse_args_jobs():
+    assert _parse_args(["-j", "2", "product01"]).jobs == 2
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1", "x"])
+def test_parse_args_invalid_jobs(jobs):
+    with pytest.raises(SystemExit):
+        _parse_args(["-j", jobs, "product01"])
@@ -1,5 +1,10 @@
 """Unit tests for the asfsmd.core module."""
 
+import io
+import os
+import json
+import time
+import errno
 import netrc
 import hashlib
 import pathlib
@@ -11,6 +16,7 @@ from xml.etree import ElementTree as etree  # noqa: N813
 import pytest
 
 import asfsmd.core
+import asfsmd.common
 
 
 def test_make_patterns_default():
@@ -20,6 +26,12 @@ def test_make_patterns_default():
     assert "S1*.SAFE/annotation/s1?-*-???-??-*.xml" in patterns
 
 
+def test_make_patterns_cached():
+    patterns = asfsmd.core.make_patterns(cal=True)
+    assert isinstance(patterns, tuple)
+    assert asfsmd.core.make_patterns(cal=True) is patterns
+
+
 @pytest.mark.parametrize(
     "kwargs",
     [
@@ -195,11 +207,94 @@ def test__is_product_complete_corrupted_component(tmp_path):
     assert not asfsmd.core._is_product_complete(product_path)
 
 
+def test__is_product_complete_verified(tmp_path):
+    product_path = tmp_path.joinpath(DEFAULT_PRODUCT)
+    writer = DummyProductWriter()
+    writer.write(product_path)
+    verified_dir = tmp_path / "verified"
+
+    file_digest = asfsmd.core._file_digest
+    with mock.patch.object(
+        asfsmd.core, "_file_digest", side_effect=file_digest
+    ) as digest:
+        assert asfsmd.core._is_product_complete(
+            product_path, verified_dir=verified_dir
+        )
+        assert digest.call_count > 0
+        assert len(list(verified_dir.iterdir())) == 1
+
+        digest.reset_mock()
+        with mock.patch.object(asfsmd.core, "_parse_manifest") as parse:
+            assert asfsmd.core._is_product_complete(
+                product_path, verified_dir=verified_dir
+            )
+            parse.assert_not_called()
+        digest.assert_not_called()
+
+        # same size, different content and modification time
+        components = list(writer.components.keys())
+        component_path = product_path.joinpath(components[-1])
+        data = component_path.read_bytes().replace(b"s", b"o")
+        component_path.write_bytes(data)
+        stat = component_path.stat()
+        os.utime(component_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert not asfsmd.core._is_product_complete(
+            product_path, verified_dir=verified_dir
+        )
+        digest.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        pytest.param("stat-only", id="missing-inventory"),
+        pytest.param([1, 2], id="not-a-dict"),
+        pytest.param({"inventory": [["x"]]}, id="malformed-inventory"),
+    ],
+)
+def test__is_product_complete_malformed_state(manifest, tmp_path):
+    product_path = tmp_path.joinpath(DEFAULT_PRODUCT)
+    writer = DummyProductWriter()
+    writer.write(product_path)
+    verified_dir = tmp_path / "verified"
+    assert asfsmd.core._is_product_complete(
+        product_path, verified_dir=verified_dir
+    )
+
+    (verified_path,) = verified_dir.iterdir()
+    state = json.loads(verified_path.read_text())
+    if manifest == "stat-only":
+        del state["manifest"]["inventory"]
+    elif isinstance(manifest, dict):
+        state["manifest"].update(manifest)
+    else:
+        state["manifest"] = manifest
+    state["components"] = None
+    verified_path.write_text(json.dumps(state))
+
+    assert asfsmd.core._is_product_complete(
+        product_path, verified_dir=verified_dir
+    )
+    state = json.loads(verified_path.read_text())
+    assert len(state["manifest"]["inventory"]) == len(writer.components)
+
+
 class DummyZipFile:
     def __init__(self, filelist):
         self.filelist = filelist
 
 
+@pytest.mark.parametrize("file_digest", [True, False])
+def test__file_digest(file_digest, tmp_path, monkeypatch):
+    if not file_digest:
+        monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    data = bytes(range(256)) * 100
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    digest = asfsmd.core._file_digest(path, "md5", block_size=1000)
+    assert digest.hexdigest() == hashlib.md5(data).hexdigest()
+
+
 def test__filter_components():
     filelist = [
         zipfile.ZipInfo(filename=""),
@@ -214,11 +309,112 @@ def test__filter_components():
     assert out == [filelist[1]]
 
 
+def test__filter_components_multiple_patterns():
+    filelist = [
+        zipfile.ZipInfo(filename="abc.txt"),
+        zipfile.ZipInfo(filename="def.dat"),
+        zipfile.ZipInfo(filename="ghi.xml"),
+    ]
+    zf = DummyZipFile(filelist=filelist)
+
+    out = asfsmd.core._filter_components(zf, patterns=["*.xml", "*.txt"])
+    assert out == [filelist[0], filelist[2]]
+
+    out = asfsmd.core._filter_components(zf, patterns=[])
+    assert out == []
+
+
+def _make_zipinfo(filename, header_offset, compress_size):
+    info = zipfile.ZipInfo(filename=filename)
+    info.header_offset = header_offset
+    info.compress_size = compress_size
+    return info
+
+
+def test__coalesce_ranges():
+    header_size = (
+        zipfile.sizeFileHeader + len("a.xml") + asfsmd.core._EXTRA_FIELD_MARGIN
+    )
+    components = [
+        _make_zipinfo("a.xml", 3000, 100),
+        _make_zipinfo("a.xml", 0, 1000),
+        _make_zipinfo("a.xml", 1000 + header_size, 1000),
+        _make_zipinfo("a.xml", 10000, 100),
+    ]
+    ranges = asfsmd.core._coalesce_ranges(components, max_gap=1000)
+    assert ranges == [
+        (0, 3000 + header_size + 100),
+        (10000, 10000 + header_size + 100),
+    ]
+
+
+def test__coalesce_ranges_empty():
+    assert asfsmd.core._coalesce_ranges([]) == []
+
+
 class NummyNetrc(netrc.netrc):
     def __init__(self, file=None):
         super().__init__(file="dummy")
 
 
+def test__get_client_type(monkeypatch):
+    monkeypatch.setenv("ASFSMD_CLIENT", "httpio")
+    client_type = asfsmd.core._get_client_type()
+    assert client_type.__module__ == "asfsmd.httpio_client"
+    assert asfsmd.core._get_client_type("httpio") is client_type
+
+
+def test_query_chunks():
+    products = [f"product{idx:03d}" for idx in range(120)]
+
+    def granule_search(names):
+        return [
+            mock.Mock(properties={"sceneName": n, "processingLevel": "SLC"})
+            for n in names
+        ]
+
+    with mock.patch(
+        "asf_search.granule_search", side_effect=granule_search
+    ) as search:
+        results = asfsmd.core.query(products)
+
+    assert search.call_count == 3
+    assert [r.properties["sceneName"] for r in results] == products
+
+
+def test__pipelined_copy():
+    data = bytes(range(256)) * 1000
+    dst = io.BytesIO()
+    asfsmd.core._pipelined_copy(io.BytesIO(data), dst, block_size=1000)
+    assert dst.getvalue() == data
+
+
+def test__pipelined_copy_write_error():
+    dst = mock.Mock()
+    dst.write.side_effect = OSError("disk full")
+    src = mock.Mock(wraps=io.BytesIO(b"x" * 100_000))
+    with pytest.raises(OSError, match="disk full"):
+        asfsmd.core._pipelined_copy(src, dst, block_size=10, depth=2)
+    # reading stops soon after the failure, without consuming the source
+    assert dst.write.call_count == 1
+    assert src.read.call_count <= 10
+
+
+@pytest.mark.parametrize("block_size", [10, asfsmd.common.BLOCKSIZE])
+def test__download(block_size, tmp_path):
+    data = bytes(range(256)) * 100
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("component.xml", data)
+    outfile = tmp_path / "component.xml"
+    with zipfile.ZipFile(archive) as zf:
+        info = zf.getinfo("component.xml")
+        asfsmd.core._download(
+            zf, info, outfile, block_size=block_size, noprogress=True
+        )
+    assert outfile.read_bytes() == data
+
+
 @mock.patch("netrc.netrc")
 def test__get_auth(netrc):
     auth = asfsmd.core._get_auth("user", "password")
@@ -256,3 +452,167 @@ def test__get_auth_noauth(tmp_path):
     with mock.patch("netrc.netrc", new_callable=lambda: fake_netrc):
         with pytest.raises(FileNotFoundError):
             asfsmd.core._get_auth()
+
+
+class DummyClient(asfsmd.common.AbstractClient):
+    def __init__(self):
+        self.archives = {}
+
+    def open_zip_archive(self, url):
+        return zipfile.ZipFile(self.archives[url])
+
+
+def _make_product_archive(path: pathlib.Path, product: str = DEFAULT_PRODUCT):
+    product_path = path / product
+    writer = DummyProductWriter()
+    writer.write(product_path)
+    archive_path = path / product.replace(".SAFE", ".zip")
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for item in sorted(product_path.rglob("*")):
+            zf.write(item, item.relative_to(path).as_posix())
+    return archive_path, product_path
+
+
+@pytest.fixture
+def remote_product(tmp_path, monkeypatch):
+    """Make a dummy product archive available via DummyClient.
+
+    Return the URL of the archive and the path of the source product.
+    """
+    archive_path, product_path = _make_product_archive(tmp_path / "remote")
+    url = f"https://example.com/{archive_path.name}"
+    client = DummyClient()
+    client.archives[url] = archive_path
+    monkeypatch.setattr(
+        asfsmd.core, "_get_client_type", lambda name=None: lambda **kw: client
+    )
+    return url, product_path
+
+
+def test_download_components_from_urls(remote_product, tmp_path, monkeypatch):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", "")
+    url, product_path = remote_product
+    outdir = tmp_path / "out"
+
+    asfsmd.core.download_components_from_urls(
+        (item for item in [url]), outdir=outdir, noprogress=True
+    )
+
+    out_product_path = outdir / DEFAULT_PRODUCT
+    for item in product_path.rglob("*"):
+        if item.is_file():
+            outfile = out_product_path / item.relative_to(product_path)
+            assert outfile.read_bytes() == item.read_bytes()
+    assert asfsmd.core._is_product_complete(out_product_path)
+
+    # products already on disk: the client is never instantiated
+    with mock.patch.object(asfsmd.core, "_get_client_type") as client_type:
+        asfsmd.core.download_components_from_urls(
+            [url], outdir=outdir, noprogress=True
+        )
+    client_type.assert_not_called()
+
+
+def test_download_components_from_urls_blob_cache(
+    remote_product, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", str(tmp_path / "cache"))
+    url, _ = remote_product
+
+    asfsmd.core.download_components_from_urls(
+        [url], outdir=tmp_path / "out1", noprogress=True
+    )
+    with mock.patch.object(
+        asfsmd.core, "_download", side_effect=AssertionError
+    ):
+        asfsmd.core.download_components_from_urls(
+            [url], outdir=tmp_path / "out2", noprogress=True
+        )
+
+    assert asfsmd.core._is_product_complete(
+        tmp_path / "out2" / DEFAULT_PRODUCT
+    )
+
+
+def test_download_components_from_urls_no_blob_cache(
+    remote_product, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", str(tmp_path / "cache"))
+    url, _ = remote_product
+
+    asfsmd.core.download_components_from_urls(
+        [url], outdir=tmp_path / "out", noprogress=True, blob_cache=False
+    )
+
+    assert not (tmp_path / "cache" / "blobs").exists()
+
+
+def test__link_or_copy_cross_device(tmp_path):
+    src = tmp_path / "src.xml"
+    src.write_bytes(b"data")
+    dst = tmp_path / "dst.xml"
+    exc = OSError(errno.EXDEV, "Invalid cross-device link")
+    with mock.patch.object(asfsmd.core.os, "link", side_effect=exc):
+        asfsmd.core._link_or_copy(src, dst)
+    assert dst.read_bytes() == b"data"
+
+
+def test__link_or_copy_error(tmp_path):
+    src = tmp_path / "src.xml"
+    src.write_bytes(b"data")
+    dst = tmp_path / "dst.xml"
+    dst.write_bytes(b"old")
+    with pytest.raises(FileExistsError):
+        asfsmd.core._link_or_copy(src, dst)
+    assert dst.read_bytes() == b"old"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param([], id="list"),
+        pytest.param({"product01": ["url", 1.0, "extra"]}, id="entry"),
+        pytest.param({"product01": "url"}, id="string-entry"),
+        pytest.param({"product01": [None, 1.0]}, id="url"),
+    ],
+)
+def test__load_query_cache_malformed(data, tmp_path):
+    path = tmp_path / "queries.json"
+    path.write_text(json.dumps(data))
+    assert asfsmd.core._load_query_cache(path) == {}
+
+
+def test__load_query_cache_skip_malformed(tmp_path):
+    path = tmp_path / "queries.json"
+    now = time.time()
+    data = {"product01": ["url01", now], "product02": ["url02"]}
+    path.write_text(json.dumps(data))
+    assert asfsmd.core._load_query_cache(path) == {"product01": ("url01", now)}
+
+
+def test__query_urls_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", str(tmp_path))
+    results = [
+        mock.Mock(properties={"sceneName": name, "url": f"{name}.zip"})
+        for name in ("product01", "product02")
+    ]
+    with mock.patch.object(
+        asfsmd.core, "query", return_value=results
+    ) as query:
+        urls = asfsmd.core._query_urls(["product01", "product02"])
+        assert urls == {
+            "product01": "product01.zip",
+            "product02": "product02.zip",
+        }
+        query.assert_called_once_with(["product01", "product02"])
+
+        query.reset_mock()
+        query.return_value = []
+        urls = asfsmd.core._query_urls(["product02"])
+        assert urls == {"product02": "product02.zip"}
+        query.assert_not_called()
+
+        with pytest.warns(UserWarning):
+            urls = asfsmd.core._query_urls(["product02", "product03"])
+        query.assert_called_once_with(["product03"])
+        assert urls == {"product02": "product02.zip"}
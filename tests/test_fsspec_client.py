@@ -0,0 +1,44 @@
+"""Unit tests for the `asfsmd.fsspec_client` module."""
+
+import io
+import zipfile
+
+import pytest
+
+import asfsmd.core
+
+pytest.importorskip("fsspec")
+pytest.importorskip("aiohttp")
+
+from asfsmd.common import MB, MAX_COMPONENT_WORKERS  # noqa: E402
+
+
+def test_download_transferred_bytes(http_server, tmp_path, monkeypatch):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", "")
+    product = "S1A_IW_SLC__1SDV_DUMMY.SAFE"
+    members = {
+        f"{product}/member{idx:02d}.bin": bytes([idx]) * 8 * MB
+        for idx in range(MAX_COMPONENT_WORKERS)
+    }
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    http_server.data = buf.getvalue()
+    host, port = http_server.server_address
+    url = f"http://{host}:{port}/{product.replace('.SAFE', '.zip')}"
+
+    asfsmd.core.download_components_from_urls(
+        [url],
+        patterns=["*.bin"],
+        outdir=tmp_path,
+        block_size=2 * MB,
+        noprogress=True,
+        client="fsspec",
+    )
+
+    for name, data in members.items():
+        assert (tmp_path / name).read_bytes() == data
+    # interleaved readers would discard the readahead cache of the file,
+    # downloading most of the data twice
+    assert http_server.nbytes <= 1.5 * len(http_server.data)
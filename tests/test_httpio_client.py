@@ -0,0 +1,279 @@
+"""Unit tests for the `asfsmd.httpio_client` module."""
+
+import io
+import os
+import re
+import zipfile
+import contextlib
+
+import pytest
+
+import asfsmd.core
+
+pytest.importorskip("httpio")
+
+import requests  # noqa: E402
+
+import asfsmd.httpio_client  # noqa: E402
+
+from asfsmd.common import MB, MAX_COMPONENT_WORKERS  # noqa: E402
+from asfsmd.httpio_client import HttpIOFile, HttpIOClient  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serve a bytes object honouring the HTTP "Range" header."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.requests = []
+        self.nbytes = 0
+
+    def get(self, url, headers=None, **kwargs):
+        size = len(self.data)
+        range_ = (headers or {}).get("Range")
+        self.requests.append(range_)
+        if range_ is None:
+            return FakeResponse(
+                200,
+                self.data,
+                {"Content-Length": str(size), "Accept-Ranges": "bytes"},
+            )
+        start, stop = re.match(r"bytes=(\d*)-(\d*)", range_).groups()
+        if not start:
+            start, stop = max(size - int(stop), 0), size - 1
+        start, stop = int(start), min(int(stop or size - 1), size - 1)
+        self.nbytes += stop + 1 - start
+        return FakeResponse(
+            206,
+            self.data[start : stop + 1],
+            {"Content-Range": f"bytes {start}-{stop}/{size}"},
+        )
+
+    def close(self):
+        pass
+
+
+def _make_archive(nmembers: int = 1, member_size: int = 1024) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for idx in range(nmembers):
+            zf.writestr(f"member{idx:02d}.bin", bytes([idx]) * member_size)
+    return buf.getvalue()
+
+
+def test_open_zip_single_request():
+    # the archive is larger than the tail but smaller than one block
+    data = _make_archive(nmembers=4, member_size=MB)
+    session = FakeSession(data)
+    fd = HttpIOFile("https://example.com/product.zip", block_size=16 * MB)
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            assert len(zf.filelist) == 4
+    assert session.requests == ["bytes=-131072"]
+
+
+def test_shared_session_not_closed():
+    data = _make_archive(nmembers=2)
+    fake_session = FakeSession(data)
+
+    class FakeAdapter(requests.adapters.BaseAdapter):
+        closed = False
+
+        def send(self, request, **kwargs):
+            fake = fake_session.get(request.url, headers=request.headers)
+            response = requests.Response()
+            response.status_code = fake.status_code
+            response.headers.update(fake.headers)
+            response.raw = io.BytesIO(fake.content)
+            response.request = request
+            return response
+
+        def close(self):
+            self.closed = True
+
+    adapter = FakeAdapter()
+    with requests.Session() as session:
+        session.mount("https://", adapter)
+        for _ in range(2):
+            fd = HttpIOFile("https://example.com/product.zip", block_size=MB)
+            with fd.open(session=session):
+                with zipfile.ZipFile(fd) as zf:
+                    assert len(zf.filelist) == 2
+            assert fd.closed
+            assert not adapter.closed
+    assert len(fake_session.requests) == 2
+    assert adapter.closed
+
+
+def test_read_across_tail():
+    data = _make_archive(nmembers=3, member_size=100_000)
+    session = FakeSession(data)
+    fd = HttpIOFile(
+        "https://example.com/product.zip", block_size=64 * 1024, tail_size=1000
+    )
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            for idx, info in enumerate(zf.filelist):
+                assert zf.read(info) == bytes([idx]) * 100_000
+        fd.seek(0)
+        assert fd.read() == data
+
+
+def test_open_zip_cached_tail(tmp_path):
+    data = _make_archive(nmembers=4, member_size=MB)
+    url = "https://example.com/product.zip"
+
+    session = FakeSession(data)
+    fd = HttpIOFile(url, block_size=16 * MB, cache_dir=tmp_path)
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            names = zf.namelist()
+    assert len(session.requests) == 1
+
+    session = FakeSession(data)
+    fd = HttpIOFile(url, block_size=16 * MB, cache_dir=tmp_path)
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            assert zf.namelist() == names
+    assert session.requests == []
+
+
+def test_cached_tail_starts_at_central_directory(tmp_path):
+    data = _make_archive(nmembers=4, member_size=1024)
+    url = "https://example.com/product.zip"
+
+    session = FakeSession(data)
+    fd = HttpIOFile(url, block_size=MB, cache_dir=tmp_path)
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            assert zf.start_dir > 0
+            start_dir = zf.start_dir
+    (path,) = (tmp_path / "tails").iterdir()
+    assert path.read_bytes()[8:] == data[start_dir:]
+
+    session = FakeSession(data)
+    fd = HttpIOFile(url, block_size=MB, cache_dir=tmp_path)
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            for idx, info in enumerate(zf.filelist):
+                assert zf.read(info) == bytes([idx]) * 1024
+    # the central directory is read from the cache
+    assert len(session.requests) == 1
+
+
+def test_tail_cache_pruned(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(asfsmd.httpio_client, "TAIL_CACHE_MAX_SIZE", 250)
+    tail_cache_dir = tmp_path / "tails"
+    tail_cache_dir.mkdir()
+    for idx in range(4):
+        path = tail_cache_dir / f"tail{idx}.bin"
+        path.write_bytes(b"x" * 100)
+        # tail0 is the least recently used one
+        os.utime(path, (idx, idx))
+
+    with HttpIOClient(auth=None):
+        pass
+
+    tails = sorted(p.name for p in tail_cache_dir.iterdir())
+    assert tails == ["tail2.bin", "tail3.bin"]
+
+
+def test_prefetch_does_not_exceed_cache():
+    block_size = 64 * 1024
+    # an oversized member, that does not fit into the cache, followed by
+    # 6 members of one block each, separated by a block of unused data
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("large.bin", b"l" * 8 * block_size)
+        zf.writestr("unused.bin", b"u" * block_size)
+        for idx in range(6):
+            zf.writestr(f"member{idx:02d}.bin", bytes([idx]) * block_size)
+            zf.writestr(f"unused{idx:02d}.bin", b"u" * block_size)
+    data = buf.getvalue()
+
+    session = FakeSession(data)
+    fd = HttpIOFile(
+        "https://example.com/product.zip",
+        block_size=block_size,
+        tail_size=1024,
+        cache_size=4 * block_size,
+    )
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf:
+            members = [i for i in zf.filelist if i.filename.startswith("m")]
+            large = zf.getinfo("large.bin")
+            session.nbytes = 0
+            fd.prefetch(
+                asfsmd.core._coalesce_ranges([large, *members], max_gap=0)
+            )
+            # the ranges following the oversized one are still prefetched
+            nrequests = len(session.requests)
+            assert zf.read(members[0]) == bytes([0]) * block_size
+            assert len(session.requests) == nrequests
+            for idx, info in enumerate(members):
+                assert zf.read(info) == bytes([idx]) * block_size
+
+    # each block is downloaded at most once
+    nblocks = len(data) // block_size + 1
+    assert session.nbytes <= nblocks * block_size
+    assert session.nbytes <= 2 * len(members) * block_size
+
+
+@pytest.mark.parametrize("block_size", [MB, 16 * MB, 64 * MB])
+def test_block_size(block_size):
+    fd = HttpIOFile(
+        "https://example.com/product.zip",
+        block_size=block_size,
+        max_readers=MAX_COMPONENT_WORKERS,
+    )
+    assert fd.block_size == block_size
+    assert fd._cache.maxsize * block_size >= asfsmd.httpio_client.CACHESIZE
+    assert fd._cache.maxsize >= 2 * MAX_COMPONENT_WORKERS
+
+
+def test_concurrent_readers():
+    block_size = 64 * 1024
+    nmembers = MAX_COMPONENT_WORKERS
+    data = _make_archive(nmembers=nmembers, member_size=8 * block_size)
+    session = FakeSession(data)
+    cache_size = 4 * block_size
+    fd = HttpIOFile(
+        "https://example.com/product.zip",
+        block_size=block_size,
+        tail_size=1024,
+        cache_size=cache_size,
+        max_readers=nmembers,
+    )
+    # two blocks per reader fit into the cache
+    assert fd._cache.maxsize >= 2 * nmembers
+    with fd.open(session=session):
+        with zipfile.ZipFile(fd) as zf, contextlib.ExitStack() as stack:
+            # interleave the reads of the components as concurrent
+            # streams do
+            streams = [stack.enter_context(zf.open(i)) for i in zf.filelist]
+            chunks = [[] for _ in streams]
+            for _ in range(8 * block_size // 10_000 + 1):
+                for stream, stream_chunks in zip(streams, chunks):
+                    stream_chunks.append(stream.read(10_000))
+            for idx, stream_chunks in enumerate(chunks):
+                assert b"".join(stream_chunks) == bytes([idx]) * 8 * block_size
+
+    # only blocks shared by two components can be downloaded twice
+    assert session.nbytes <= len(data) + nmembers * block_size
@@ -0,0 +1,41 @@
+"""Unit tests for the `asfsmd.remotezip_client` module."""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+import asfsmd.core
+
+pytest.importorskip("remotezip")
+
+from asfsmd.common import MAX_COMPONENT_WORKERS  # noqa: E402
+
+
+def test_download_multiple_components(http_server, tmp_path, monkeypatch):
+    monkeypatch.setenv("ASFSMD_CACHE_DIR", "")
+    product = "S1A_IW_SLC__1SDV_DUMMY.SAFE"
+    members = {
+        f"{product}/member{idx:02d}.bin": os.urandom(2 * 1024 * 1024)
+        for idx in range(2 * MAX_COMPONENT_WORKERS)
+    }
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    http_server.data = buf.getvalue()
+    host, port = http_server.server_address
+    url = f"http://{host}:{port}/{product.replace('.SAFE', '.zip')}"
+
+    asfsmd.core.download_components_from_urls(
+        [url],
+        patterns=["*.bin"],
+        outdir=tmp_path,
+        block_size=64 * 1024,
+        noprogress=True,
+        client="remotezip",
+    )
+
+    for name, data in members.items():
+        assert (tmp_path / name).read_bytes() == data